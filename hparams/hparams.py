@@ -2,12 +2,90 @@ from hparams.localconfig import LocalConfig
 import io
 from contextlib import redirect_stderr
 import argparse
+import atexit
 import os
-import gcsfs
+import stat
+import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+# Single worker so GCS backups are uploaded in order, off the startup path
+_gcs_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def _is_regular_file(path):
+    """ Single stat() call equivalent of os.path.isfile """
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _current_umask():
+    """ Returns the process umask, which can only be read by setting it """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _write_atomic(path, data):
+    """ Write `data` to `path` so that readers only ever see the complete file, durably once this returns """
+    dirname = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        try:
+            view = memoryview(data.encode())
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # mkstemp creates the file as 0600, give it the permissions open(path, 'w') would have
+        os.chmod(tmp_path, 0o666 & ~_current_umask())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # Persist the rename itself, directories can't be opened for fsync on Windows
+    if os.name == 'posix':
+        dir_fd = os.open(dirname, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _initialized_dist():
+    """ Returns the torch.distributed module if a process group is initialized, otherwise None """
+    # Only look at an already imported torch: importing it here would slow down every instantiation, and an
+    # initialized process group means torch.distributed has been imported anyway.
+    dist = sys.modules.get('torch.distributed')
+    if dist is not None and dist.is_available() and dist.is_initialized():
+        return dist
+    return None
+
+
+def _barrier(dist, timeout):
+    """
+    Wait for all ranks to reach a barrier, using the process group's own timeout handling.
+
+    The gloo backend supports monitored_barrier, which fails after `timeout` seconds and names the missing ranks.
+    Other backends fall back to barrier(), bounded by the timeout given to init_process_group. After a failed
+    barrier the process group is out of step across ranks and can't be used for further collectives.
+    """
+    if dist.get_backend() == 'gloo':
+        dist.monitored_barrier(timeout=timedelta(seconds=timeout))
+    else:
+        dist.barrier()
 
 
 class HParams(LocalConfig):
+    """
+    Run hyper-parameters shared across ranks. Instantiation is I/O-bound (stats, config write, rank sync).
+    """
     _loaded_hparams_objects = {}
 
     def __init__(self,
@@ -19,7 +97,7 @@ class HParams(LocalConfig):
                  global_rank=0,
                  timeout=20,
                  ):
-        if name in HParams._loaded_hparams_objects.keys():
+        if name in HParams._loaded_hparams_objects:
             raise ValueError(f"hparams {name} is being loaded a second time")
 
         # params_to_override = HParams.override_params()
@@ -35,6 +113,8 @@ class HParams(LocalConfig):
             if not gcs_backup_bucket.startswith('gs://'):
                 gcs_backup_bucket = 'gs://' + gcs_backup_bucket
 
+            # Imported here as gcsfs pulls in the google auth/HTTP client stack, which most runs don't need
+            import gcsfs
             gcs_fs = gcsfs.GCSFileSystem(project=gcs_backup_project)
             gcs_backup_bucket = os.path.join(gcs_backup_bucket, self.run.name)
 
@@ -45,39 +125,74 @@ class HParams(LocalConfig):
 
         logdir = os.path.join(project_path, 'logs', self.run.name)
         logfile = os.path.join(logdir, 'hparams.cfg')
-        sentinel_file = os.path.join(logdir, '.hparams_file_is_written')
 
-        if os.path.isdir(logdir) and os.path.isfile(logfile) and os.path.isfile(sentinel_file):
+        # When a process group is up, every rank calls the barrier exactly once (whichever branch it takes)
+        # so rank 0 can publish a new config without other ranks polling the filesystem.
+        dist = _initialized_dist()
+
+        # The logfile is written atomically, so if it exists it is complete
+        if _is_regular_file(logfile):
             # If logfile is found, assume we are resuming as old run, so use archived hparams file
             super(HParams, self).__init__()
             self.read(logfile)
             # self.update(params_to_override)
             print('Found existing {}! Resuming run using primary parameters!'.format(logfile))
+            if dist is not None:
+                _barrier(dist, timeout)
         else:
             if global_rank == 0:
                 os.makedirs(logdir, exist_ok=True)
-                self.save_config(logfile)
-                with open(sentinel_file, 'w') as f:
-                    f.write('okay')
+                _write_atomic(logfile, str(self))
                 print('No existing config found. New run config file saved in {}'.format(logfile))
+                if dist is not None:
+                    _barrier(dist, timeout)
             else:
-                start_time = time.time()
-                while not os.path.isfile(sentinel_file):
-                    if time.time() - start_time > timeout:
-                        raise TimeoutError(f"Rank {global_rank} timed out waiting for {logfile} after {timeout}s")
-                    time.sleep(0.1)
+                if dist is not None:
+                    _barrier(dist, timeout)
+                    # read() silently skips missing files, which would leave this rank with an empty config
+                    if not _is_regular_file(logfile):
+                        raise FileNotFoundError(f"Rank {global_rank} passed the barrier but {logfile} does not exist")
+                else:
+                    # Poll with exponential backoff to limit stat() load on shared filesystems
+                    start_time = time.time()
+                    delay = 0.1
+                    while not _is_regular_file(logfile):
+                        elapsed = time.time() - start_time
+                        if elapsed > timeout:
+                            raise TimeoutError(f"Rank {global_rank} timed out waiting for {logfile} after {timeout}s")
+                        time.sleep(min(delay, max(timeout - elapsed, 0.01)))
+                        delay = min(delay * 2, 2.0)
 
                 super(HParams, self).__init__()
                 self.read(logfile)
                 print(f'Rank {global_rank} loaded new config from {logfile}')
 
+        self._gcs_backup_future = None
         if gcs_fs is not None and global_rank == 0:
             gcs_path = os.path.join(gcs_backup_bucket, os.path.basename(logfile))
             print(f'Backing up hparams file to {gcs_path}')
-            gcs_fs.put(lpath=logfile, rpath=gcs_path)
+            self._gcs_backup_future = _gcs_executor.submit(gcs_fs.put, lpath=logfile, rpath=gcs_path)
+            # Make sure the upload finishes (and its errors surface) before the interpreter exits
+            atexit.register(self._gcs_backup_future.result)
 
         self.add_to_global_collections(name)
 
+    def wait_for_gcs_backup(self, timeout=None):
+        """
+        Block until the GCS backup of the hparams file, if any, is uploaded.
+
+        :param float timeout: Maximum number of seconds to wait. Waits indefinitely if None.
+        :raise: Any exception raised while uploading the backup.
+        """
+        if self._gcs_backup_future is not None:
+            self._gcs_backup_future.result(timeout=timeout)
+
+    def __getstate__(self):
+        state = super(HParams, self).__getstate__()
+        # Futures can't be pickled, the backup is only tracked by the process that started it
+        state['_gcs_backup_future'] = None
+        return state
+
     def add_to_global_collections(self, name):
         HParams._loaded_hparams_objects[name] = self
 
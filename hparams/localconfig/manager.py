@@ -6,8 +6,8 @@ import sys
 import configparser
 
 from hparams.localconfig.utils import (
-    is_float, is_int, is_bool, is_none, is_config, CONFIG_KEY_RE, to_bool,
-    CONFIG_KEY_TYPE_RE, validate_type, parse_type_hint
+    is_float, is_int, is_bool, is_none, is_config, to_bool,
+    match_config_line, validate_type, parse_type_hint
 )
 
 NON_ALPHA_NUM = re.compile('[^A-Za-z0-9]')
@@ -178,11 +178,11 @@ class LocalConfig(object):
                 continue
 
             # Check for type-annotated config: key: type = value
-            type_match = CONFIG_KEY_TYPE_RE.match(stripped)
-            if type_match:
-                key = type_match.group(1).strip()
-                type_hint = type_match.group(2).strip()
-                value = type_match.group(3).strip()
+            line_match = match_config_line(stripped)
+            if line_match and line_match.group('type') is not None:
+                key = line_match.group('key')
+                type_hint = line_match.group('type').strip()
+                value = line_match.group('value').strip()
 
                 # Store type hint
                 type_hints[(current_section, key)] = type_hint
@@ -322,19 +322,13 @@ class LocalConfig(object):
                     self._comments[section] = comment.rstrip()
 
             else:
-                # Check for type-annotated config: key: type = value
-                type_match = CONFIG_KEY_TYPE_RE.match(line)
-                if type_match:
-                    key = type_match.group(1).strip()
-                    type_hint = type_match.group(2).strip()
-                    self._add_dot_key(section, key)
-                    self._type_hints[(section, key)] = type_hint
-                    if comment:
-                        self._comments[(section, key)] = comment.rstrip()
-
-                elif CONFIG_KEY_RE.match(line):  # Config without type hint
-                    key = line.split('=', 1)[0].strip()
+                # Config with or without type hint: key: type = value, key = value
+                line_match = match_config_line(line)
+                if line_match:
+                    key = line_match.group('key')
                     self._add_dot_key(section, key)
+                    if line_match.group('type') is not None:
+                        self._type_hints[(section, key)] = line_match.group('type').strip()
                     if comment:
                         self._comments[(section, key)] = comment.rstrip()
 
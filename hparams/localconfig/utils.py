@@ -1,5 +1,7 @@
 import re
-from typing import Any, Optional, Type, Union, get_origin, get_args
+import string
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional
 
 # Matches: key = value (original format)
 CONFIG_KEY_RE = re.compile(r'[A-Za-z0-9\-\_\.]+\s*=')
@@ -11,6 +13,25 @@ CONFIG_KEY_TYPE_RE = re.compile(
     r'^([A-Za-z0-9\-\_\.]+)\s*:\s*([A-Za-z0-9_\[\],\s\|]+)\s*=\s*(.*)$'
 )
 
+# Matches either format in a single pass: key = value, or key: type = value
+# Named groups: key, type (None when there is no type hint), value
+CONFIG_LINE_RE = re.compile(
+    r'^(?P<key>[A-Za-z0-9\-\_\.]+)\s*(?::\s*(?P<type>[A-Za-z0-9_\[\],\s\|]+))?\s*=\s*(?P<value>.*)$'
+)
+
+# Numeric literals accepted by int() / float(), so is_int/is_float can reject strings without raising.
+# Covers surrounding whitespace, underscores between digits, exponents and inf/nan like the builtins do.
+# The builtins strip Unicode whitespace except the \x1c-\x1f separators, which \s would also match, and only
+# take ASCII letters in inf/nan, which re.IGNORECASE would not guarantee (e.g. 'ınf').
+_DIGITS = r'\d+(?:_\d+)*'
+_SPACE = r'[^\S\x1c-\x1f]*'
+INT_RE = re.compile(_SPACE + r'[+-]?' + _DIGITS + _SPACE)
+FLOAT_RE = re.compile(
+    r'{1}[+-]?(?:(?:{0}(?:\.(?:{0})?)?|\.{0})(?:[eE][+-]?{0})?|{2}){1}'.format(
+        _DIGITS, _SPACE, r'[iI][nN][fF](?:[iI][nN][iI][tT][yY])?|[nN][aA][nN]'
+    )
+)
+
 # Supported type names mapping to Python types
 TYPE_MAP = {
     'int': int,
@@ -23,35 +44,98 @@ TYPE_MAP = {
     'None': type(None),
 }
 
+# Lowercased string forms recognized as booleans / None
+_BOOL_STRS = frozenset({'true', 'false', 'yes', 'no', 'on', 'off'})
+_TRUE_STRS = frozenset({'true', 'yes', 'on'})
+_NONE_STR = str(None).lower()
+
+# Type names are ASCII, so hints are lowercased once up front with a translation table
+_LOWER_TBL = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Containers at least this long are first checked in bulk, see :func:`_items_have_exact_types`
+_BULK_CHECK_MIN_LEN = 64
+
+
+class ParsedHint(NamedTuple):
+    """ A parsed type hint, see :func:`parse_type_hint` """
+    base_types: tuple
+    is_optional: bool
+    inner_types: Optional[tuple]
+    #: Types accepted by isinstance() for the value (int is also valid for float hints)
+    check_types: tuple
+    #: Function converting a value to the first base type, used by :func:`coerce_to_type`
+    coercer: Callable[[Any], Any]
+
+
+def _coerce_bool(value):
+    if isinstance(value, str) and is_bool(value):
+        return to_bool(value)
+    return bool(value)
+
+
+# Coercers for types that need more than calling the type itself, keyed on the target type
+_COERCERS = {
+    bool: _coerce_bool,
+}
+
+
+def _make_hint(base_types, is_optional, inner_types):
+    base_types = tuple(base_types)
+    check_types = base_types
+    if float in base_types and int not in base_types:
+        check_types = base_types + (int,)
+    coercer = _COERCERS.get(base_types[0], base_types[0])
+    return ParsedHint(base_types, is_optional, inner_types, check_types, coercer)
+
 
 def is_float(value):
     """ Checks if the value is a float """
+    if isinstance(value, str):
+        return FLOAT_RE.fullmatch(value) is not None
     return _is_type(value, float)
 
 
 def is_int(value):
     """ Checks if the value is an int """
+    if isinstance(value, str):
+        return INT_RE.fullmatch(value) is not None
     return _is_type(value, int)
 
 
 def is_bool(value):
     """ Checks if the value is a bool """
-    return value.lower() in ['true', 'false', 'yes', 'no', 'on', 'off']
+    return value.lower() in _BOOL_STRS
 
 
 def is_none(value):
     """ Checks if the value is a None """
-    return value.lower() == str(None).lower()
+    return value.lower() == _NONE_STR
 
 
 def to_bool(value):
     """ Converts value to a bool """
-    return value.lower() in ['true', 'yes', 'on']
+    return value.lower() in _TRUE_STRS
 
 
-def is_config(value):
+def is_config(value, _match=CONFIG_KEY_RE.match):
     """ Checks if the value is possible config content """
-    return '\n' in value or CONFIG_KEY_RE.match(value)
+    # `_match` is bound at definition time so the lookup is a local, not a global + attribute
+    return '\n' in value or _match(value) is not None
+
+
+def match_config_line(line, _match=CONFIG_LINE_RE.match):
+    """
+    Match a config line in either 'key = value' or 'key: type = value' format.
+
+    :param str line: Config line, without leading indentation
+    :return: Match object with 'key', 'type' (None if there is no type hint) and 'value' groups, or None
+    """
+    return _match(line)
+
+
+def _items_have_exact_types(items, types):
+    """ Checks in a single C-level pass that every item's exact type is one of `types` """
+    return set(map(type, items)).issubset(types)
 
 
 def _is_type(value, type):
@@ -62,145 +146,137 @@ def _is_type(value, type):
         return False
 
 
-def parse_type_hint(type_str: str) -> tuple:
+@lru_cache(maxsize=256)
+def parse_type_hint(type_str: str) -> ParsedHint:
     """
-    Parse a type hint string into a tuple of (base_types, is_optional, inner_types).
+    Parse a type hint string into a :class:`ParsedHint`.
 
     Examples:
-        'int' -> ([int], False, None)
-        'Optional[int]' -> ([int], True, None)
-        'int | None' -> ([int], True, None)
-        'int | str' -> ([int, str], False, None)
-        'int | str | None' -> ([int, str], True, None)
-        'list[int]' -> ([list], False, (int,))
-        'dict[str, int]' -> ([dict], False, (str, int))
-        'Optional[list[str]]' -> ([list], True, (str,))
+        'int' -> ((int,), False, None)
+        'Optional[int]' -> ((int,), True, None)
+        'int | None' -> ((int,), True, None)
+        'int | str' -> ((int, str), False, None)
+        'int | str | None' -> ((int, str), True, None)
+        'list[int]' -> ((list,), False, (int,))
+        'dict[str, int]' -> ((dict,), False, (str, int))
+        'Optional[list[str]]' -> ((list,), True, (str,))
+
+    Performance: CPU-bound pure Python string parsing, memoized with lru_cache so it runs once per distinct
+    hint. :func:`validate_type` goes through the per-hint validators cached by :func:`get_validator`.
 
     Returns:
-        (base_types, is_optional, inner_types) where:
-        - base_types: List of allowed Python types
+        ParsedHint(base_types, is_optional, inner_types, check_types, coercer) where:
+        - base_types: Tuple of allowed Python types
         - is_optional: Whether None is allowed
         - inner_types: Tuple of inner types for generics (e.g., (int,) for list[int], (str, int) for dict[str, int])
+        - check_types: base_types, plus int when float is allowed, ready to pass to isinstance()
+        - coercer: Function converting a value to the first of base_types
     """
-    type_str = type_str.strip()
+    # Lowercase once for matching, type names (and Optional) are case-insensitive. Lowercasing keeps every offset,
+    # so `raw` is sliced and split alongside to report tokens in errors as they were written.
+    raw = type_str.strip()
+    type_str = raw.translate(_LOWER_TBL)
     is_optional = False
     inner_types = None
 
     # Handle pipe union syntax: int | str | None
     if '|' in type_str:
         parts = [p.strip() for p in type_str.split('|')]
+        raw_parts = [p.strip() for p in raw.split('|')]
         base_types = []
 
-        for part in parts:
-            if part.lower() == 'none':
+        for part, raw_part in zip(parts, raw_parts):
+            if part == 'none':
                 is_optional = True
             else:
-                t = TYPE_MAP.get(part.lower())
+                t = TYPE_MAP.get(part)
                 if t is None:
-                    raise TypeError(f"Unknown type: {part}")
+                    raise TypeError(f"Unknown type: {raw_part}")
                 base_types.append(t)
 
         if not base_types:
-            raise TypeError(f"Union type must have at least one non-None type: {type_str}")
+            raise TypeError(f"Union type must have at least one non-None type: {raw}")
 
-        return (base_types, is_optional, inner_types)
+        return _make_hint(base_types, is_optional, inner_types)
 
     # Handle Optional[X]
-    if type_str.startswith('Optional[') and type_str.endswith(']'):
+    if type_str.startswith('optional[') and type_str.endswith(']'):
         is_optional = True
         type_str = type_str[9:-1].strip()
+        raw = raw[9:-1].strip()
 
     # Handle generic types like list[int], dict[str, int]
     if '[' in type_str:
-        base_name = type_str[:type_str.index('[')]
-        inner_str = type_str[type_str.index('[') + 1:-1].strip()
+        bracket = type_str.index('[')
+        base_name = type_str[:bracket]
+        inner_str = type_str[bracket + 1:-1].strip()
 
-        base_type = TYPE_MAP.get(base_name.lower())
+        base_type = TYPE_MAP.get(base_name)
         if base_type is None:
-            raise TypeError(f"Unknown type: {base_name}")
+            raise TypeError(f"Unknown type: {raw[:bracket]}")
 
         # Parse inner types
         inner_parts = [p.strip() for p in inner_str.split(',')]
+        raw_inner_parts = [p.strip() for p in raw[bracket + 1:-1].split(',')]
         inner_types = tuple(
-            TYPE_MAP.get(p.lower()) for p in inner_parts
+            TYPE_MAP.get(p) for p in inner_parts
         )
 
         # Validate all inner types are known
-        for i, (part, typ) in enumerate(zip(inner_parts, inner_types)):
+        for i, (part, typ) in enumerate(zip(raw_inner_parts, inner_types)):
             if typ is None:
                 raise TypeError(f"Unknown inner type: {part}")
 
-        return ([base_type], is_optional, inner_types)
+        return _make_hint((base_type,), is_optional, inner_types)
 
     # Simple type
-    base_type = TYPE_MAP.get(type_str.lower())
+    base_type = TYPE_MAP.get(type_str)
     if base_type is None:
-        raise TypeError(f"Unknown type: {type_str}")
+        raise TypeError(f"Unknown type: {raw}")
 
-    return ([base_type], is_optional, inner_types)
+    return _make_hint((base_type,), is_optional, inner_types)
 
 
-def validate_type(value: Any, type_hint: str) -> bool:
-    """
-    Validate that a value matches the declared type hint.
+def _fmt_type_err(value, base_types):
+    """ Error message for a value not matching any of `base_types`, only built when raising """
+    type_names = ' | '.join(t.__name__ for t in base_types)
+    return f"Expected {type_names}, got {type(value).__name__} (value: {repr(value)})"
 
-    Args:
-        value: The Python value to validate
-        type_hint: The type hint string (e.g., 'int', 'Optional[str]', 'list[int]', 'dict[str, int]')
 
-    Returns:
-        True if value matches the type hint
+def _list_items_checker(inner_types):
+    """ Returns a function raising TypeError if a list's items don't match `inner_types` """
+    item_type = inner_types[0]
+    item_types = (item_type, int) if item_type == float else (item_type,)
 
-    Raises:
-        TypeError: If value doesn't match the declared type
-    """
-    base_types, is_optional, inner_types = parse_type_hint(type_hint)
+    def check_items(value):
+        # Large lists are usually homogeneous: skip the per-item loop when every exact type is allowed.
+        # Subclasses and mismatches fall through to the loop, which also reports the offending index.
+        if len(value) >= _BULK_CHECK_MIN_LEN and _items_have_exact_types(value, item_types):
+            return
 
-    # Handle None values
-    if value is None:
-        if is_optional:
-            return True
-        raise TypeError(f"Value is None but type '{type_hint}' is not Optional")
-
-    # Check if value matches any of the allowed base types
-    type_matched = False
-    matched_type = None
-
-    for base_type in base_types:
-        # Special handling: int is also valid for float type hints
-        if base_type == float and isinstance(value, (int, float)):
-            type_matched = True
-            matched_type = base_type
-            break
-        elif isinstance(value, base_type):
-            type_matched = True
-            matched_type = base_type
-            break
-
-    if not type_matched:
-        type_names = ' | '.join(t.__name__ for t in base_types)
-        raise TypeError(
-            f"Expected {type_names}, got {type(value).__name__} "
-            f"(value: {repr(value)})"
-        )
-
-    # Check inner types for lists
-    if inner_types is not None and matched_type == list:
-        item_type = inner_types[0]
         for i, item in enumerate(value):
-            if not isinstance(item, item_type):
-                # Allow int items in float lists
-                if item_type == float and isinstance(item, int):
-                    continue
+            # Allow int items in float lists
+            if not isinstance(item, item_types):
                 raise TypeError(
                     f"List item at index {i} expected {item_type.__name__}, "
                     f"got {type(item).__name__} (value: {repr(item)})"
                 )
 
-    # Check inner types for dicts
-    if inner_types is not None and matched_type == dict:
-        key_type = inner_types[0] if len(inner_types) > 0 else None
-        value_type = inner_types[1] if len(inner_types) > 1 else None
+    return check_items
+
+
+def _dict_items_checker(inner_types):
+    """ Returns a function raising TypeError if a dict's keys or values don't match `inner_types` """
+    key_type = inner_types[0] if len(inner_types) > 0 else None
+    value_type = inner_types[1] if len(inner_types) > 1 else None
+    # Allow int values in float dicts
+    value_types = (value_type, int) if value_type == float else (value_type,)
+
+    def check_items(value):
+        if len(value) >= _BULK_CHECK_MIN_LEN and (
+                (key_type is None or _items_have_exact_types(value.keys(), (key_type,))) and
+                (value_type is None or _items_have_exact_types(value.values(), value_types))):
+            return
 
         for k, v in value.items():
             if key_type is not None and not isinstance(k, key_type):
@@ -208,16 +284,75 @@ def validate_type(value: Any, type_hint: str) -> bool:
                     f"Dict key expected {key_type.__name__}, "
                     f"got {type(k).__name__} (key: {repr(k)})"
                 )
-            if value_type is not None and not isinstance(v, value_type):
-                # Allow int values in float dicts
-                if value_type == float and isinstance(v, int):
-                    continue
+            if value_type is not None and not isinstance(v, value_types):
                 raise TypeError(
                     f"Dict value for key {repr(k)} expected {value_type.__name__}, "
                     f"got {type(v).__name__} (value: {repr(v)})"
                 )
 
-    return True
+    return check_items
+
+
+@lru_cache(maxsize=256)
+def get_validator(type_hint: str) -> Callable[[Any], bool]:
+    """
+    Build a validator function for a type hint, see :func:`validate_type`.
+
+    The hint is parsed once and the returned function only runs the checks that apply to it, so validating many
+    values against the same hint skips parsing and branching on the hint. Validators are cached per hint string.
+
+    Args:
+        type_hint: The type hint string (e.g., 'int', 'Optional[str]', 'list[int]', 'dict[str, int]')
+
+    Returns:
+        A function taking a value, returning True if it matches the type hint and raising TypeError otherwise
+    """
+    base_types, is_optional, inner_types, check_types, _ = parse_type_hint(type_hint)
+
+    # Generic hints have a single base type, so a match means the value is of that type
+    matched_type = base_types[0] if inner_types is not None else None
+    if matched_type == list:
+        check_items = _list_items_checker(inner_types)
+    elif matched_type == dict:
+        check_items = _dict_items_checker(inner_types)
+    else:
+        check_items = None
+
+    def validator(value):
+        # Handle None values
+        if value is None:
+            if is_optional:
+                return True
+            raise TypeError(f"Value is None but type '{type_hint}' is not Optional")
+
+        # Check if value matches any of the allowed base types
+        if not isinstance(value, check_types):
+            raise TypeError(_fmt_type_err(value, base_types))
+
+        # Check inner types for lists and dicts
+        if check_items is not None:
+            check_items(value)
+
+        return True
+
+    return validator
+
+
+def validate_type(value: Any, type_hint: str) -> bool:
+    """
+    Validate that a value matches the declared type hint.
+
+    Args:
+        value: The Python value to validate
+        type_hint: The type hint string (e.g., 'int', 'Optional[str]', 'list[int]', 'dict[str, int]')
+
+    Returns:
+        True if value matches the type hint
+
+    Raises:
+        TypeError: If value doesn't match the declared type
+    """
+    return get_validator(type_hint)(value)
 
 
 def coerce_to_type(value: Any, type_hint: str) -> Any:
@@ -234,34 +369,21 @@ def coerce_to_type(value: Any, type_hint: str) -> Any:
     Raises:
         TypeError: If coercion is not possible
     """
-    base_types, is_optional, inner_types = parse_type_hint(type_hint)
+    hint = parse_type_hint(type_hint)
 
     # Handle None
     if value is None:
-        if is_optional:
+        if hint.is_optional:
             return None
         raise TypeError(f"Cannot coerce None to non-optional type '{type_hint}'")
 
     # Check if already correct type
-    for base_type in base_types:
-        if isinstance(value, base_type):
-            return value
+    if isinstance(value, hint.base_types):
+        return value
 
     # Try coercion to first type in union
-    base_type = base_types[0]
-
-    # Special case: int to float
-    if base_type == float and isinstance(value, int):
-        return float(value)
-
-    # Special case: bool strings
-    if base_type == bool and isinstance(value, str):
-        if is_bool(value):
-            return to_bool(value)
-
-    # Try direct conversion
     try:
-        return base_type(value)
+        return hint.coercer(value)
     except (ValueError, TypeError) as e:
         raise TypeError(
             f"Cannot coerce {type(value).__name__} to {type_hint}: {e}"